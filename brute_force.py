@@ -0,0 +1,290 @@
+# Copyright [yyyy] [name of copyright owner]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Exhaustive ground-truth oracle for small object/box assignment instances.
+
+Every object is placed in at most one box, so instead of enumerating all
+2^(objects*boxes) binary assignments we enumerate one choice per object
+(one of its eligible boxes, or no box at all). Choice vectors are decoded
+from a mixed-radix index and scored in numpy chunks; the index range can
+be sharded over a process pool.
+
+The oracle returns the complete set of optimal assignments (including
+every degenerate optimum) and the distribution of the objective value
+over all feasible assignments, e.g.
+
+    from brute_force import brute_force
+    from instances import CASE2_2NODES
+
+    result = brute_force(**CASE2_2NODES)
+    print(result.optimum, len(result.solutions))
+
+Assignments are tuples with one entry per object: the box index, or None
+when the object is not placed in any box.
+
+The cost of a run is the number of choice vectors, the product over
+objects of (eligible boxes + 1), not the number of x_i_j variables: 15
+objects with 2 eligible boxes each (3^15, about 14 million vectors) take a
+few seconds, 30 objects with one eligible box each (2^30) would take
+minutes. Instances above MAX_ASSIGNMENTS choice vectors are rejected
+unless a larger ``max_assignments`` is passed explicitly.
+
+Integer tables are scored exactly. Tables with fractional values are
+scaled to integers with ``decimals`` decimal places before scoring, so
+the budget check, the optimal set and the distribution do not depend on
+float rounding (0.1 + 0.2 is the same objective value as 0.3).
+"""
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+BruteForceResult = namedtuple(
+    "BruteForceResult",
+    ["optimum", "solutions", "distribution", "num_feasible", "num_assignments"])
+
+# about 16 million choice vectors, a few seconds in a single process
+MAX_ASSIGNMENTS = 1 << 24
+
+# decimal places kept when scaling fractional tables to integers
+DECIMALS = 6
+
+
+def _tables(costs, profits, decimals):
+    """Per-object integer choice tables padded to the largest number of choices.
+
+    Choice 0 is always "no box" (box -1, zero cost and profit). Returns the
+    tables and the factor the values were scaled by (1 for integer tables).
+    """
+    num_objects = len(costs)
+    choices = [[j for j, c in enumerate(row) if c is not None] for row in costs]
+    radices = np.array([len(c) + 1 for c in choices], dtype=np.int64)
+    width = int(radices.max())
+
+    # score in integers so that ties in the objective are exact
+    values = [v for row in costs for v in row if v is not None]
+    if profits is not None:
+        values += [v for row in profits for v in row if v is not None]
+    scale = 1 if all(float(v).is_integer() for v in values) else 10 ** decimals
+
+    box_table = np.full((num_objects, width), -1, dtype=np.int64)
+    cost_table = np.zeros((num_objects, width), dtype=np.int64)
+    profit_table = np.zeros((num_objects, width), dtype=np.int64)
+    for i, boxes in enumerate(choices):
+        for k, j in enumerate(boxes, start=1):
+            box_table[i, k] = j
+            cost_table[i, k] = round(costs[i][j] * scale)
+            if profits is not None:
+                if profits[i][j] is None:
+                    raise ValueError(f"object {i} has a cost but no profit for box {j}")
+                profit_table[i, k] = round(profits[i][j] * scale)
+    return radices, box_table, cost_table, profit_table, scale
+
+
+def _score_range(radices, box_table, cost_table, profit_table, num_boxes,
+                 maximize, global_budget, box_min, box_max, start, stop, chunk_size):
+    """Score the choice vectors with mixed-radix index in [start, stop)."""
+    num_objects = len(radices)
+    rows = np.arange(num_objects)
+    best = None
+    best_indices = []
+    distribution = Counter()
+    num_feasible = 0
+
+    for lo in range(start, stop, chunk_size):
+        index = np.arange(lo, min(lo + chunk_size, stop), dtype=np.int64)
+
+        # decode the mixed-radix index into one choice per object
+        choice = np.empty((len(index), num_objects), dtype=np.int64)
+        rest = index
+        for i in range(num_objects):
+            rest, choice[:, i] = np.divmod(rest, radices[i])
+
+        box = box_table[rows, choice]
+        total_cost = cost_table[rows, choice].sum(axis=1)
+
+        feasible = np.ones(len(index), dtype=bool)
+        for j in range(num_boxes):
+            count = (box == j).sum(axis=1)
+            feasible &= count >= box_min
+            if box_max is not None:
+                feasible &= count <= box_max
+        if global_budget is not None:
+            feasible &= total_cost <= global_budget
+
+        if not feasible.any():
+            continue
+        index = index[feasible]
+        if maximize:
+            objective = profit_table[rows, choice[feasible]].sum(axis=1)
+        else:
+            objective = total_cost[feasible]
+
+        num_feasible += len(index)
+        values, counts = np.unique(objective, return_counts=True)
+        distribution.update(dict(zip(values.tolist(), counts.tolist())))
+
+        chunk_best = objective.max() if maximize else objective.min()
+        if best is None or (chunk_best > best if maximize else chunk_best < best):
+            best = chunk_best
+            best_indices = []
+        if chunk_best == best:
+            best_indices.append(index[objective == best])
+
+    if best is not None:
+        best = best.item()
+    best_indices = np.concatenate(best_indices) if best_indices else np.empty(0, dtype=np.int64)
+    return best, best_indices, distribution, num_feasible
+
+
+def _decode(index, radices, box_table):
+    """Convert a mixed-radix index into an assignment tuple."""
+    assignment = []
+    for i, radix in enumerate(radices):
+        index, k = divmod(int(index), int(radix))
+        j = int(box_table[i, k])
+        assignment.append(j if j >= 0 else None)
+    return tuple(assignment)
+
+
+def brute_force(costs, profits=None, global_budget=None, box_min=1, box_max=None,
+                chunk_size=1 << 16, processes=None, max_assignments=MAX_ASSIGNMENTS, decimals=DECIMALS):
+    """Enumerate all assignments and return every optimal one.
+
+    Minimizes the total cost when ``profits`` is None, otherwise maximizes
+    the total profit. ``processes`` shards the enumeration over a process
+    pool of that size; by default everything runs in this process.
+    Raises ValueError if the instance has more than ``max_assignments``
+    choice vectors. Fractional tables are compared at ``decimals`` decimal
+    places.
+    """
+    num_boxes = len(costs[0])
+    maximize = profits is not None
+    radices, box_table, cost_table, profit_table, scale = _tables(costs, profits, decimals)
+    if global_budget is not None:
+        global_budget = round(global_budget * scale)
+    num_assignments = int(np.prod(radices.astype(object)))
+    if num_assignments > min(max_assignments, np.iinfo(np.int64).max):
+        raise ValueError(f"{num_assignments} assignments are too many to enumerate "
+                         f"(max_assignments={max_assignments})")
+
+    args = (radices, box_table, cost_table, profit_table, num_boxes,
+            maximize, global_budget, box_min, box_max)
+
+    if processes is None or processes <= 1:
+        shards = [_score_range(*args, 0, num_assignments, chunk_size)]
+    else:
+        # a few shards per worker so an uneven split doesn't leave workers idle
+        bounds = np.linspace(0, num_assignments, 4 * processes + 1).astype(np.int64)
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [pool.submit(_score_range, *args, int(lo), int(hi), chunk_size)
+                       for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+            shards = [f.result() for f in futures]
+
+    best = None
+    best_indices = []
+    distribution = Counter()
+    num_feasible = 0
+    for shard_best, shard_indices, shard_distribution, shard_feasible in shards:
+        distribution.update(shard_distribution)
+        num_feasible += shard_feasible
+        if shard_best is None:
+            continue
+        if best is None or (shard_best > best if maximize else shard_best < best):
+            best = shard_best
+            best_indices = []
+        if shard_best == best:
+            best_indices.extend(shard_indices.tolist())
+
+    solutions = [_decode(index, radices, box_table) for index in sorted(best_indices)]
+    distribution = dict(sorted(distribution.items(), reverse=maximize))
+    if scale != 1:
+        best = None if best is None else best / scale
+        distribution = {value / scale: count for value, count in distribution.items()}
+    return BruteForceResult(best, solutions, distribution, num_feasible, num_assignments)
+
+
+def sample_to_assignment(sample, num_objects, num_boxes):
+    """Convert a sample over the scripts' x_i_j variables into an assignment.
+
+    Returns None if an object is placed in more than one box.
+    """
+    assignment = []
+    for i in range(num_objects):
+        boxes = [j for j in range(num_boxes) if sample.get(f"x_{i}_{j}") == 1]
+        if len(boxes) > 1:
+            return None
+        assignment.append(boxes[0] if boxes else None)
+    return tuple(assignment)
+
+
+def score_assignment(assignment, costs, profits=None, global_budget=None, box_min=1, box_max=None,
+                     decimals=DECIMALS):
+    """Return the objective value of an assignment, or None if it is infeasible.
+
+    Totals are rounded to ``decimals`` decimal places, as in brute_force.
+    """
+    num_boxes = len(costs[0])
+    counts = [0] * num_boxes
+    total_cost = 0
+    total_profit = 0
+    for i, j in enumerate(assignment):
+        if j is None:
+            continue
+        if costs[i][j] is None:
+            return None
+        counts[j] += 1
+        total_cost += costs[i][j]
+        if profits is not None:
+            total_profit += profits[i][j]
+
+    if any(c < box_min or (box_max is not None and c > box_max) for c in counts):
+        return None
+    if global_budget is not None and round(total_cost, decimals) > round(global_budget, decimals):
+        return None
+    return round(total_profit if profits is not None else total_cost, decimals)
+
+
+def score_sample(sample, costs, profits=None, global_budget=None, box_min=1, box_max=None,
+                 decimals=DECIMALS):
+    """Return the objective value of a sampler's sample, or None if it is infeasible."""
+    assignment = sample_to_assignment(sample, len(costs), len(costs[0]))
+    if assignment is None:
+        return None
+    return score_assignment(assignment, costs, profits, global_budget, box_min, box_max, decimals)
+
+
+if __name__ == "__main__":
+    from instances import INSTANCES
+
+    for name, instance in INSTANCES.items():
+        start = time.time()
+        result = brute_force(**instance)
+        end = time.time()
+
+        print(f"---------- {name} ----------")
+        print("Assignments enumerated: ", result.num_assignments)
+        print("Feasible assignments: ", result.num_feasible)
+        print("Optimal objective value: ", result.optimum)
+        print("Time taken by brute force: ", end - start)
+        print("Objective distribution (value: count): ", result.distribution)
+
+        for option, solution in enumerate(result.solutions, start=1):
+            print(f"---- Option {option}-----")
+            for i, j in enumerate(solution):
+                if j is not None:
+                    print(f"Object {i + 1} is placed in Box {j + 1}")
+        print("total optimal options: ", len(result.solutions))
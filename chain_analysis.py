@@ -0,0 +1,312 @@
+# Copyright [yyyy] [name of copyright owner]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Headless chain-strength and chain-break analysis for the QPU path.
+
+The mp_case*.py scripts sample through ``EmbeddingComposite`` with its
+default chain strength and open ``dwave.inspector`` to look at the
+result. This module instead embeds an instance once, samples the embedded
+problem at a sweep of chain strengths and unembeds every sample set with
+each chain-break resolution method, recording
+
+ - the chain-length distribution of the embedding
+ - the mean fraction of broken chains and of samples with a broken chain
+ - the fraction of reads that are feasible and optimal (checked against
+   the exhaustive oracle in brute_force.py), and the mean energy
+
+for every (chain strength, chain-break method) setting, and recommends a
+setting for the instance. Chain strengths are given as prefactors of
+``uniform_torque_compensation``; 1.414 is the ``EmbeddingComposite``
+default.
+
+By default the problem is sampled by a local stand-in for the QPU: a
+simulated annealer restricted to a Pegasus graph. Run with ``--qpu`` to
+sample on a live ``DWaveSampler`` instead. The annealer has no control
+errors, so on the shipped instances its chains rarely break above a
+prefactor of about 0.2; the sweep starts well below that so the
+chain-break methods can be told apart.
+"""
+import argparse
+import math
+import time
+from collections import Counter, namedtuple
+
+import dimod
+import dwave_networkx as dnx
+import minorminer
+from dwave.embedding import embed_bqm, unembed_sampleset
+from dwave.embedding.chain_breaks import MinimizeEnergy, discard, majority_vote, weighted_random
+from dwave.embedding.chain_strength import uniform_torque_compensation
+from dwave.samplers import SimulatedAnnealingSampler
+
+from brute_force import brute_force, score_sample
+
+CHAIN_STRENGTH_PREFACTORS = (0.05, 0.1, 0.2, 0.5, 0.75, 1.0, 1.414, 2.0, 3.0)
+CHAIN_BREAK_METHODS = ("majority_vote", "minimize_energy", "weighted_random", "discard")
+
+ChainStrengthRecord = namedtuple(
+    "ChainStrengthRecord",
+    ["prefactor", "chain_strength", "method", "chain_break_fraction", "broken_sample_fraction",
+     "feasible_fraction", "optimal_fraction", "best_objective", "mean_energy", "num_reads"])
+
+Recommendation = namedtuple("Recommendation", ["record", "tied_methods", "runner_up", "significant"])
+Recommendation.__doc__ = """Result of recommend.
+
+record: the best ChainStrengthRecord
+tied_methods: chain-break methods that do not do significantly worse at its chain strength
+runner_up: the best record at any other chain strength, or None
+significant: whether record is significantly better than runner_up
+"""
+
+
+def build_bqm(costs, profits=None, global_budget=None, box_min=1, box_max=None, lagrange=600):
+    """Build the BQM of an instance the same way the mp_case*.py scripts do."""
+    num_objects = len(costs)
+    num_boxes = len(costs[0])
+    bqm = dimod.BinaryQuadraticModel('BINARY')
+
+    # Define decision variables: x[i][j] is 1 if object i is assigned to box j
+    x = [[f'x_{i}_{j}' for j in range(num_boxes)] for i in range(num_objects)]
+
+    # Objective: Minimize the total cost or maximize the total profit
+    for i in range(num_objects):
+        for j in range(num_boxes):
+            if costs[i][j] is not None:
+                bqm.add_variable(x[i][j], costs[i][j] if profits is None else -profits[i][j])
+
+    # Constraint: Each object can be placed in at most one box
+    for i in range(num_objects):
+        bqm.add_linear_inequality_constraint(
+            [(x[i][j], 1) for j in range(num_boxes) if costs[i][j] is not None],
+            lb=0, ub=1,
+            lagrange_multiplier=lagrange,
+            label=f"object_{i}_assignment"
+        )
+
+    # Constraint: Number of objects in each box
+    for j in range(num_boxes):
+        terms = [(x[i][j], 1) for i in range(num_objects) if costs[i][j] is not None]
+        if box_max == box_min:
+            bqm.add_linear_equality_constraint(terms, constant=-box_min, lagrange_multiplier=lagrange)
+        else:
+            bqm.add_linear_inequality_constraint(
+                terms,
+                lb=box_min, ub=len(terms) if box_max is None else box_max,
+                lagrange_multiplier=lagrange,
+                label=f"box_{j}_assignment"
+            )
+
+    # Constraint: Total cost of all objects in all boxes must be within the global budget
+    if global_budget is not None:
+        cost_constraints = [(x[i][j], costs[i][j]) for i in range(num_objects)
+                            for j in range(num_boxes) if costs[i][j] is not None]
+        bqm.add_linear_inequality_constraint(cost_constraints,
+                                             lb=0, ub=global_budget,
+                                             lagrange_multiplier=lagrange,
+                                             label='total_cost_limit')
+    return bqm
+
+
+def pegasus_stand_in(m=6):
+    """Return a simulated annealer restricted to a Pegasus P(m) graph."""
+    graph = dnx.pegasus_graph(m)
+    return dimod.StructureComposite(SimulatedAnnealingSampler(), graph.nodes, graph.edges)
+
+
+def find_embedding(bqm, sampler, random_seed=None):
+    """Find a minor embedding of the BQM into the sampler's working graph.
+
+    Variables without interactions are placed on single unused qubits.
+    """
+    embedding = {}
+    if bqm.num_interactions:
+        embedding = minorminer.find_embedding(list(bqm.quadratic), sampler.edgelist, random_seed=random_seed)
+        if not embedding:
+            raise ValueError("no embedding found")
+
+    # minorminer only sees the interactions, so isolated variables are missing
+    isolated = [v for v in bqm.variables if v not in embedding]
+    used = {q for chain in embedding.values() for q in chain}
+    free = [q for q in sampler.nodelist if q not in used]
+    if len(free) < len(isolated):
+        raise ValueError(f"not enough unused qubits for the uncoupled variables {isolated}")
+    embedding.update((v, [q]) for v, q in zip(isolated, free))
+    return embedding
+
+
+def chain_length_distribution(embedding):
+    """Return {chain length: number of chains} of an embedding."""
+    return dict(sorted(Counter(len(chain) for chain in embedding.values()).items()))
+
+
+def _resolve(method, bqm, embedding):
+    if method == "majority_vote":
+        return majority_vote
+    if method == "minimize_energy":
+        return MinimizeEnergy(bqm, embedding)
+    if method == "weighted_random":
+        return weighted_random
+    if method == "discard":
+        return discard
+    raise ValueError(f"unknown chain-break method {method!r}")
+
+
+def sweep_chain_strength(bqm, sampler, embedding, instance, optimum=None,
+                         prefactors=CHAIN_STRENGTH_PREFACTORS, methods=CHAIN_BREAK_METHODS,
+                         num_reads=100, **sample_kwargs):
+    """Sample the embedded BQM at each chain strength and score every chain-break method.
+
+    ``instance`` is the instance dict the BQM was built from, used to check
+    the feasibility of the unembedded samples. ``optimum`` defaults to the
+    brute-force optimum of the instance. All methods of one chain strength
+    unembed the same physical samples, so they are compared on equal terms.
+    Returns a list of ChainStrengthRecord.
+    """
+    if optimum is None:
+        optimum = brute_force(**instance).optimum
+
+    records = []
+    for prefactor in prefactors:
+        chain_strength = uniform_torque_compensation(bqm, embedding, prefactor=prefactor)
+        target_bqm = embed_bqm(bqm, embedding, sampler.adjacency, chain_strength=chain_strength)
+        target_sampleset = sampler.sample(target_bqm, num_reads=num_reads, **sample_kwargs)
+        total_reads = target_sampleset.record.num_occurrences.sum()
+
+        # chain breaks depend only on the physical samples, not on how they are resolved
+        kept = unembed_sampleset(target_sampleset, embedding, bqm,
+                                 chain_break_method=majority_vote, chain_break_fraction=True)
+        breaks = kept.record.chain_break_fraction
+        occurrences = kept.record.num_occurrences
+        chain_break_fraction = (breaks * occurrences).sum() / total_reads
+        broken_sample_fraction = occurrences[breaks > 0].sum() / total_reads
+
+        for method in methods:
+            sampleset = unembed_sampleset(target_sampleset, embedding, bqm,
+                                          chain_break_method=_resolve(method, bqm, embedding))
+            feasible = 0
+            optimal = 0
+            best_objective = None
+            energy = 0.0
+            for s in sampleset.data(['sample', 'energy', 'num_occurrences']):
+                energy += s.energy * s.num_occurrences
+                objective = score_sample(s.sample, **instance)
+                if objective is None:
+                    continue
+                feasible += s.num_occurrences
+                if objective == optimum:
+                    optimal += s.num_occurrences
+                if best_objective is None or (objective > best_objective if instance.get("profits")
+                                              else objective < best_objective):
+                    best_objective = objective
+
+            # discarded reads count as neither feasible nor optimal
+            kept_reads = sampleset.record.num_occurrences.sum() if len(sampleset) else 0
+            records.append(ChainStrengthRecord(
+                prefactor, chain_strength, method,
+                chain_break_fraction, broken_sample_fraction,
+                feasible / total_reads, optimal / total_reads, best_objective,
+                energy / kept_reads if kept_reads else None, int(total_reads)))
+    return records
+
+
+def _beats(a, b, z):
+    """Whether record a has significantly more optimal (or else feasible) reads than b.
+
+    A difference is significant when it exceeds z standard errors of the
+    difference of the two read fractions.
+    """
+    for field in ("optimal_fraction", "feasible_fraction"):
+        p, q = getattr(a, field), getattr(b, field)
+        error = math.sqrt(p * (1 - p) / a.num_reads + q * (1 - q) / b.num_reads)
+        if p - q > z * error and p > q:
+            return True
+        if q - p > z * error and q > p:
+            return False
+    return False
+
+
+def recommend(records, z=2.0):
+    """Pick the setting with the most optimal reads and say how sure the pick is.
+
+    Ties go to the most feasible reads, then to fewer broken chains, then
+    to the weaker chain strength. The pick is only significant if it beats
+    the best setting at every other chain strength by more than ``z``
+    standard errors; chain-break methods at the picked chain strength that
+    it does not beat are reported as tied.
+    """
+    ranked = sorted(records, key=lambda r: (r.optimal_fraction, r.feasible_fraction,
+                                            -r.chain_break_fraction, -r.chain_strength), reverse=True)
+    best = ranked[0]
+    tied_methods = [r.method for r in ranked
+                    if r.prefactor == best.prefactor and not _beats(best, r, z)]
+    others = [r for r in ranked if r.prefactor != best.prefactor]
+    runner_up = others[0] if others else None
+    significant = runner_up is None or _beats(best, runner_up, z)
+    return Recommendation(best, tied_methods, runner_up, significant)
+
+
+def report(records):
+    """Print one line per (chain strength, chain-break method) setting."""
+    print(f"{'prefactor':>9} {'strength':>10} {'method':>16} {'chain breaks':>12} "
+          f"{'broken reads':>12} {'feasible':>8} {'optimal':>8} {'best':>6} {'mean energy':>12}")
+    for r in records:
+        mean_energy = "-" if r.mean_energy is None else f"{r.mean_energy:.1f}"
+        print(f"{r.prefactor:>9} {r.chain_strength:>10.1f} {r.method:>16} {r.chain_break_fraction:>12.3f} "
+              f"{r.broken_sample_fraction:>12.3f} {r.feasible_fraction:>8.3f} {r.optimal_fraction:>8.3f} "
+              f"{str(r.best_objective):>6} {mean_energy:>12}")
+
+
+if __name__ == "__main__":
+    from instances import INSTANCES
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--qpu", action="store_true", help="sample on a live DWaveSampler")
+    parser.add_argument("--num-reads", type=int, default=100, help="reads per chain strength")
+    parser.add_argument("--seed", type=int, default=None, help="seed for the embedding")
+    args = parser.parse_args()
+
+    if args.qpu:
+        from dwave.system import DWaveSampler
+        sampler = DWaveSampler()
+    else:
+        sampler = pegasus_stand_in()
+
+    for name, instance in INSTANCES.items():
+        print(f"---------- {name} ----------")
+        bqm = build_bqm(**instance)
+        embedding = find_embedding(bqm, sampler, random_seed=args.seed)
+        print(f"Number of logical variables: {len(embedding.keys())}")
+        print(f"Number of physical qubits used in embedding: {sum(len(chain) for chain in embedding.values())}")
+        print("Chain length distribution (length: chains): ", chain_length_distribution(embedding))
+
+        start = time.time()
+        records = sweep_chain_strength(bqm, sampler, embedding, instance, num_reads=args.num_reads)
+        end = time.time()
+        print("Time taken by chain strength sweep: ", end - start)
+        report(records)
+
+        recommendation = recommend(records)
+        best = recommendation.record
+        if recommendation.significant:
+            print(f"Recommended setting: chain_strength={best.chain_strength:.1f} (prefactor {best.prefactor})")
+        else:
+            runner_up = recommendation.runner_up
+            print(f"No recommendation: prefactor {best.prefactor} ({best.optimal_fraction:.3f} optimal) is not "
+                  f"significantly better than prefactor {runner_up.prefactor} ({runner_up.optimal_fraction:.3f} "
+                  f"optimal) at {best.num_reads} reads, increase --num-reads")
+        if len(recommendation.tied_methods) > 1:
+            print("Chain-break methods tie at this chain strength: ", ", ".join(recommendation.tied_methods))
+        else:
+            print(f"Recommended chain_break_method={best.method}")
@@ -0,0 +1,101 @@
+# Copyright [yyyy] [name of copyright owner]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Cost/profit tables of the assignment problems solved in the mp_case*.py
+scripts, in a form that can be imported without running the solvers.
+
+Each instance is a dict of keyword arguments understood by the analysis
+tools (for example ``brute_force.brute_force(**instances.CASE1)``):
+
+ - costs: cost[i][j] of placing object i in box j (None if not allowed)
+ - profits: profit[i][j] in the same format, or None to minimize cost
+ - global_budget: upper bound on the total cost, or None for no budget
+ - box_min, box_max: bounds on the number of objects in each box
+   (box_max None means no upper bound)
+
+Objects can be placed in at most one box in all instances.
+"""
+
+# mp_case1.py: minimize cost, each box has exactly one object
+CASE1 = dict(
+    costs=[
+        [300, None, None],   # Object 1 - V1
+        [120, 120, None],    # Object 2 - V2
+        [140, 140, 140],     # Object 3 - V3
+        [None, 150, None],   # Object 4 - I1
+        [None, 160, 160],    # Object 5 - I2
+        [None, None, 150],   # Object 6 - I3
+        [None, 300, None],   # Object 7 - I12
+        [None, None, 300]    # Object 8 - I23
+    ],
+    profits=None,
+    global_budget=None,
+    box_min=1,
+    box_max=1,
+)
+
+# mp_case2.py: maximize profit within a global budget, each box has at least one object
+CASE2 = dict(
+    costs=[
+        [300, None, None],   # Object 1 - V1
+        [120, 120, None],    # Object 2 - V2
+        [140, 140, 140],     # Object 3 - V3
+        [None, 150, None],   # Object 4 - I1
+        [None, 160, 160],    # Object 5 - I2
+        [None, None, 150],   # Object 6 - I3
+        [None, 300, None],   # Object 7 - I12
+        [None, None, 300]    # Object 8 - I23
+    ],
+    profits=[
+        [10, None, None],    # Object 1 - V1
+        [6, 6, None],        # Object 2 - V2
+        [4, 4, 4],           # Object 3 - V3
+        [None, 8, None],     # Object 4 - I1
+        [None, 8, 8],        # Object 5 - I2
+        [None, None, 8],     # Object 6 - I3
+        [None, 10, None],    # Object 7 - I12
+        [None, None, 10]     # Object 8 - I23
+    ],
+    global_budget=500,
+    box_min=1,
+    box_max=None,
+)
+
+# mp_case2_2nodes.py: as mp_case2.py with two boxes
+CASE2_2NODES = dict(
+    costs=[
+        [300, None],         # Object 1 - V1
+        [120, 120],          # Object 2 - V2
+        [None, 150],         # Object 3 - I1
+        [None, 160],         # Object 4 - I2
+        [None, 300]          # Object 5 - I12
+    ],
+    profits=[
+        [10, None],          # Object 1 - V1
+        [6, 6],              # Object 2 - V2
+        [None, 8],           # Object 3 - I1
+        [None, 8],           # Object 4 - I2
+        [None, 10]           # Object 5 - I12
+    ],
+    global_budget=300,
+    box_min=1,
+    box_max=None,
+)
+
+INSTANCES = {
+    "mp_case1": CASE1,
+    "mp_case2": CASE2,
+    "mp_case2_2nodes": CASE2_2NODES,
+}
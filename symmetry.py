@@ -0,0 +1,276 @@
+# Copyright [yyyy] [name of copyright owner]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Symmetry analysis for object/box assignment instances.
+
+Objects with identical rows in the cost and profit tables (same eligible
+boxes, same values) are interchangeable, and so are boxes with identical
+columns. A solver that works on the individual x_i_j variables explores
+every relabelling of such objects and boxes separately.
+
+This module groups interchangeable objects into classes and replaces
+their binary variables with integer counts n_c_j (number of objects of
+class c placed in box j). Interchangeable boxes are ordered with
+symmetry-breaking constraints, so the reduced model has one solution per
+group of equivalent assignments. Reduced solutions can be expanded back
+into every equivalent assignment, e.g.
+
+    import pulp
+    from instances import CASE1
+    from symmetry import find_symmetries, build_reduced_problem, expand_counts
+
+    reduction = find_symmetries(CASE1["costs"], CASE1["profits"])
+    prob, n = build_reduced_problem(reduction, **CASE1)
+    prob.solve()
+    counts = {key: int(round(pulp.value(var))) for key, var in n.items()}
+    assignments = expand_counts(counts, reduction)
+
+Assignments use the same format as brute_force.py: a tuple with the box
+index of each object, or None when the object is not placed.
+"""
+import itertools
+import math
+import time
+from collections import Counter, namedtuple
+
+import pulp
+
+SymmetryReduction = namedtuple(
+    "SymmetryReduction",
+    ["object_classes", "box_classes", "eligible", "num_assignments", "num_aggregated", "box_symmetry"])
+SymmetryReduction.__doc__ = """Result of find_symmetries.
+
+object_classes: lists of interchangeable object indices
+box_classes: lists of interchangeable box indices
+eligible: eligible boxes of each object class
+num_assignments: number of assignments of the original model
+num_aggregated: number of count configurations after aggregating object classes
+box_symmetry: box relabellings removed by the symmetry-breaking constraints (upper bound)
+"""
+
+
+def _group(keys):
+    """Group indices by equal keys, keeping the order of first appearance."""
+    groups = {}
+    for index, key in enumerate(keys):
+        groups.setdefault(key, []).append(index)
+    return list(groups.values())
+
+
+def _check_tables(costs, profits):
+    """Raise ValueError if an eligible cell has no profit."""
+    if profits is None:
+        return
+    for i, row in enumerate(costs):
+        for j, c in enumerate(row):
+            if c is not None and profits[i][j] is None:
+                raise ValueError(f"object {i} has a cost but no profit for box {j}")
+
+
+def find_symmetries(costs, profits=None):
+    """Group identical rows (objects) and columns (boxes) of the tables."""
+    _check_tables(costs, profits)
+    num_objects = len(costs)
+    num_boxes = len(costs[0])
+    if profits is None:
+        profits = [[None] * num_boxes for _ in range(num_objects)]
+
+    rows = [tuple(zip(costs[i], profits[i])) for i in range(num_objects)]
+    columns = [tuple((costs[i][j], profits[i][j]) for i in range(num_objects)) for j in range(num_boxes)]
+    object_classes = _group(rows)
+    box_classes = _group(columns)
+    eligible = [[j for j in range(num_boxes) if costs[members[0]][j] is not None]
+                for members in object_classes]
+
+    num_assignments = math.prod(len(e) + 1 for e in (
+        [j for j in range(num_boxes) if costs[i][j] is not None] for i in range(num_objects)))
+    # ways to put at most m identical objects into k boxes: C(m + k, k)
+    num_aggregated = math.prod(math.comb(len(members) + len(boxes), len(boxes))
+                               for members, boxes in zip(object_classes, eligible))
+    box_symmetry = math.prod(math.factorial(len(members)) for members in box_classes)
+
+    return SymmetryReduction(object_classes, box_classes, eligible,
+                             num_assignments, num_aggregated, box_symmetry)
+
+
+def build_reduced_problem(reduction, costs, profits=None, global_budget=None, box_min=1, box_max=None,
+                          symmetry_breaking=True):
+    """Build the aggregated PuLP model.
+
+    Returns the problem and a dict mapping (class, box) to its integer
+    count variable. Minimizes the total cost when ``profits`` is None,
+    otherwise maximizes the total profit within ``global_budget``.
+    """
+    _check_tables(costs, profits)
+    num_boxes = len(costs[0])
+    sense = pulp.LpMaximize if profits is not None else pulp.LpMinimize
+    prob = pulp.LpProblem("Reduced_Object_Assignment", sense)
+
+    n = {}
+    for c, (members, boxes) in enumerate(zip(reduction.object_classes, reduction.eligible)):
+        for j in boxes:
+            n[c, j] = pulp.LpVariable(f"n_{c}_{j}", lowBound=0, upBound=len(members), cat="Integer")
+
+    def total(table):
+        return pulp.lpSum(table[reduction.object_classes[c][0]][j] * var for (c, j), var in n.items())
+
+    # Objective: total profit or total cost, every member of a class has the same values
+    prob += total(profits if profits is not None else costs), "Objective"
+
+    # Constraint: Each object can be placed in at most one box
+    for c, members in enumerate(reduction.object_classes):
+        prob += pulp.lpSum(var for (k, j), var in n.items() if k == c) <= len(members), f"Class_{c}_at_most_{len(members)}"
+
+    # Constraint: Number of objects in each box
+    for j in range(num_boxes):
+        in_box = pulp.lpSum(var for (c, k), var in n.items() if k == j)
+        prob += in_box >= box_min, f"Box_{j}_at_least_{box_min}"
+        if box_max is not None:
+            prob += in_box <= box_max, f"Box_{j}_at_most_{box_max}"
+
+    # Constraint: Total cost within the global budget
+    if global_budget is not None:
+        prob += total(costs) <= global_budget, "Total_Cost_Limit"
+
+    # Symmetry breaking: the count vectors of interchangeable boxes are in
+    # non-increasing lexicographic order. Weights are the mixed-radix place
+    # values of the counts, so comparing weighted sums compares lexicographically.
+    if symmetry_breaking:
+        weights = []
+        place = 1
+        for members in reversed(reduction.object_classes):
+            weights.append(place)
+            place *= len(members) + 1
+        weights.reverse()
+
+        for boxes in reduction.box_classes:
+            for j1, j2 in zip(boxes[:-1], boxes[1:]):
+                prob += (pulp.lpSum(weights[c] * var for (c, j), var in n.items() if j == j1)
+                         >= pulp.lpSum(weights[c] * var for (c, j), var in n.items() if j == j2)), \
+                    f"Box_{j1}_before_box_{j2}"
+
+    return prob, n
+
+
+def compress_assignment(assignment, reduction):
+    """Return the class counts {(class, box): n} of an assignment."""
+    counts = Counter()
+    for c, members in enumerate(reduction.object_classes):
+        for i in members:
+            if assignment[i] is not None:
+                counts[c, assignment[i]] += 1
+    return dict(counts)
+
+
+def _multiset_permutations(items):
+    """Yield the distinct orderings of items."""
+    remaining = Counter(items)
+    keys = list(remaining)
+    ordering = []
+
+    def visit(depth):
+        if depth == len(items):
+            yield tuple(ordering)
+            return
+        for key in keys:
+            if remaining[key]:
+                remaining[key] -= 1
+                ordering.append(key)
+                yield from visit(depth + 1)
+                ordering.pop()
+                remaining[key] += 1
+
+    yield from visit(0)
+
+
+def _box_relabellings(reduction):
+    """Yield every box mapping that permutes boxes within their classes."""
+    for perms in itertools.product(*(itertools.permutations(b) for b in reduction.box_classes)):
+        mapping = {}
+        for boxes, perm in zip(reduction.box_classes, perms):
+            mapping.update(zip(boxes, perm))
+        yield mapping
+
+
+def expand_counts(counts, reduction):
+    """Return the assignments equivalent to ``counts``.
+
+    These are the relabellings of interchangeable objects and boxes of this
+    one count configuration. Other optimal configurations that are not
+    symmetric to it (e.g. ties between different objects) are not
+    included; use brute_force.brute_force for the full optimal set.
+    """
+    num_objects = sum(len(members) for members in reduction.object_classes)
+    counts = {key: n for key, n in counts.items() if n}
+
+    relabelled = {frozenset(((c, mapping[j]), n) for (c, j), n in counts.items())
+                  for mapping in _box_relabellings(reduction)}
+
+    assignments = set()
+    for config in relabelled:
+        config = dict(config)
+        per_class = []
+        for c, members in enumerate(reduction.object_classes):
+            boxes = [j for (k, j), n in sorted(config.items()) if k == c for _ in range(n)]
+            boxes += [None] * (len(members) - len(boxes))
+            per_class.append(list(_multiset_permutations(boxes)))
+
+        for choice in itertools.product(*per_class):
+            assignment = [None] * num_objects
+            for members, boxes in zip(reduction.object_classes, choice):
+                for i, j in zip(members, boxes):
+                    assignment[i] = j
+            assignments.add(tuple(assignment))
+
+    return sorted(assignments, key=lambda a: [-1 if j is None else j for j in a])
+
+
+def report(reduction):
+    """Print the object/box classes and the size of the reduced search space."""
+    print("Interchangeable objects: ",
+          [[i + 1 for i in members] for members in reduction.object_classes if len(members) > 1] or "none")
+    print("Interchangeable boxes: ",
+          [[j + 1 for j in members] for members in reduction.box_classes if len(members) > 1] or "none")
+    print("Assignments in the original model: ", reduction.num_assignments)
+    print("Count configurations after aggregating objects: ", reduction.num_aggregated)
+    print("Box relabellings removed by symmetry breaking (at most): ", reduction.box_symmetry)
+    print("Search space reduction factor (up to): ",
+          reduction.num_assignments / reduction.num_aggregated * reduction.box_symmetry)
+
+
+if __name__ == "__main__":
+    from instances import INSTANCES
+
+    for name, instance in INSTANCES.items():
+        print(f"---------- {name} ----------")
+        reduction = find_symmetries(instance["costs"], instance["profits"])
+        report(reduction)
+
+        prob, n = build_reduced_problem(reduction, **instance)
+        start_time_classical = time.time()
+        prob.solve(pulp.PULP_CBC_CMD(msg=False))
+        end_time_classical = time.time()
+        print("Status: ", pulp.LpStatus[prob.status])
+        print("Objective value: ", pulp.value(prob.objective))
+        print("Total time taken by classical solver: ", end_time_classical - start_time_classical)
+
+        counts = {key: int(round(pulp.value(var))) for key, var in n.items()}
+        assignments = expand_counts(counts, reduction)
+        for option, assignment in enumerate(assignments, start=1):
+            print(f"---- Equivalent option {option}-----")
+            for i, j in enumerate(assignment):
+                if j is not None:
+                    print(f"Object {i + 1} is placed in Box {j + 1}")
+        print("total equivalent options: ", len(assignments))
@@ -0,0 +1,67 @@
+# Copyright [yyyy] [name of copyright owner]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from brute_force import brute_force, score_assignment
+from instances import CASE1, CASE2, CASE2_2NODES
+
+
+class TestBruteForce(unittest.TestCase):
+    def test_case1(self):
+        result = brute_force(**CASE1)
+        self.assertEqual(result.optimum, 410)
+        self.assertEqual(len(result.solutions), 3)
+
+    def test_case2(self):
+        result = brute_force(**CASE2)
+        self.assertEqual(result.optimum, 22)
+        self.assertEqual(len(result.solutions), 3)
+        self.assertEqual(result.distribution, {22: 3, 20: 3, 18: 6})
+
+    def test_case2_2nodes(self):
+        result = brute_force(**CASE2_2NODES)
+        self.assertEqual(result.optimum, 14)
+
+    def test_process_pool(self):
+        for instance in (CASE1, CASE2, CASE2_2NODES):
+            single = brute_force(**instance)
+            sharded = brute_force(**instance, processes=2, chunk_size=64)
+            self.assertEqual((sharded.optimum, sharded.solutions, sharded.distribution),
+                             (single.optimum, single.solutions, single.distribution))
+
+    def test_solutions_score_optimum(self):
+        for instance in (CASE1, CASE2, CASE2_2NODES):
+            result = brute_force(**instance)
+            for solution in result.solutions:
+                self.assertEqual(score_assignment(solution, **instance), result.optimum)
+
+    def test_too_many_assignments(self):
+        costs = [[100]] * 30
+        with self.assertRaises(ValueError):
+            brute_force(costs, box_max=None)
+
+    def test_float_tables(self):
+        # 0.2 + 0.1 is within a budget of 0.3
+        instance = dict(costs=[[0.2], [0.1], [0.3]], profits=[[0.2], [0.1], [0.3]],
+                        global_budget=0.3, box_min=1, box_max=2)
+        result = brute_force(**instance)
+        self.assertEqual(result.optimum, 0.3)
+        self.assertEqual(result.solutions, [(0, 0, None), (None, None, 0)])
+        for solution in result.solutions:
+            self.assertEqual(score_assignment(solution, **instance), result.optimum)
+
+        # 0.1 + 0.2 and 0.15 + 0.15 are the same objective value
+        result = brute_force([[0.1], [0.2], [0.15], [0.15]], box_min=2, box_max=2)
+        self.assertEqual(result.distribution, {0.25: 2, 0.3: 2, 0.35: 2})
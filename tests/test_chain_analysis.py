@@ -0,0 +1,86 @@
+# Copyright [yyyy] [name of copyright owner]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import dimod
+
+from chain_analysis import (ChainStrengthRecord, build_bqm, chain_length_distribution, find_embedding,
+                            pegasus_stand_in, recommend, sweep_chain_strength)
+from instances import CASE2_2NODES
+
+
+class TestChainAnalysis(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sampler = pegasus_stand_in()
+        cls.bqm = build_bqm(**CASE2_2NODES)
+        cls.embedding = find_embedding(cls.bqm, cls.sampler, random_seed=1)
+        cls.records = sweep_chain_strength(cls.bqm, cls.sampler, cls.embedding, CASE2_2NODES,
+                                           prefactors=(0.01, 0.2, 1.414), num_reads=20, seed=1)
+
+    def test_chain_length_distribution(self):
+        distribution = chain_length_distribution(self.embedding)
+        self.assertEqual(sum(distribution.values()), self.bqm.num_variables)
+
+    def test_fractions(self):
+        self.assertEqual(len(self.records), 3 * 4)
+        for r in self.records:
+            for fraction in (r.chain_break_fraction, r.broken_sample_fraction,
+                             r.feasible_fraction, r.optimal_fraction):
+                self.assertGreaterEqual(fraction, 0)
+                self.assertLessEqual(fraction, 1)
+            self.assertGreaterEqual(r.feasible_fraction, r.optimal_fraction)
+            self.assertEqual(r.num_reads, 20)
+
+    def test_discard(self):
+        for r in self.records:
+            if r.method == "discard":
+                self.assertLessEqual(r.feasible_fraction, 1 - r.broken_sample_fraction + 1e-12)
+
+    def test_weak_chains(self):
+        weak = {r.method: r for r in self.records if r.prefactor == 0.01}
+        self.assertGreater(weak["majority_vote"].chain_break_fraction, 0)
+        # discard drops every read with a broken chain, so it keeps fewer reads
+        # than it was given, and none at all if every read has a break
+        self.assertGreater(weak["discard"].broken_sample_fraction, 0)
+        self.assertEqual(weak["discard"].mean_energy is None, weak["discard"].broken_sample_fraction == 1)
+        self.assertLess(weak["minimize_energy"].mean_energy, weak["majority_vote"].mean_energy)
+
+    def test_uncoupled_variables(self):
+        bqm = dimod.BinaryQuadraticModel({"a": 1, "b": 1, "c": 2}, {("a", "b"): 1}, 0, "BINARY")
+        embedding = find_embedding(bqm, self.sampler, random_seed=1)
+        self.assertEqual(set(embedding), {"a", "b", "c"})
+        self.assertEqual(len(embedding["c"]), 1)
+        self.assertFalse(set(embedding["c"]) & set(embedding["a"] + embedding["b"]))
+
+
+class TestRecommend(unittest.TestCase):
+    def record(self, prefactor, method, optimal, num_reads=100):
+        return ChainStrengthRecord(prefactor, 100 * prefactor, method, 0.0, 0.0,
+                                   optimal, optimal, None, None, num_reads)
+
+    def test_tied_methods(self):
+        records = [self.record(1.0, "majority_vote", 0.5), self.record(1.0, "discard", 0.5),
+                   self.record(2.0, "majority_vote", 0.1), self.record(2.0, "discard", 0.1)]
+        recommendation = recommend(records)
+        self.assertEqual(recommendation.record.prefactor, 1.0)
+        self.assertTrue(recommendation.significant)
+        self.assertEqual(recommendation.tied_methods, ["majority_vote", "discard"])
+
+    def test_noise(self):
+        records = [self.record(0.5, "majority_vote", 0.18, 50), self.record(1.0, "majority_vote", 0.12, 50)]
+        recommendation = recommend(records)
+        self.assertFalse(recommendation.significant)
+        self.assertEqual(recommendation.runner_up.prefactor, 1.0)
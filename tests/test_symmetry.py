@@ -0,0 +1,72 @@
+# Copyright [yyyy] [name of copyright owner]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import pulp
+
+from brute_force import brute_force, score_assignment
+from symmetry import build_reduced_problem, expand_counts, find_symmetries
+
+# Objects 1 and 2 have identical rows, boxes 1 and 2 identical columns
+COSTS = [
+    [100, 100, 50],
+    [100, 100, 50],
+    [200, 200, None],
+    [None, None, 80],
+]
+PROFITS = [
+    [5, 5, 3],
+    [5, 5, 3],
+    [8, 8, None],
+    [None, None, 4],
+]
+INSTANCES = [
+    dict(costs=COSTS, profits=None, global_budget=None, box_min=1, box_max=1),
+    dict(costs=COSTS, profits=PROFITS, global_budget=300, box_min=1, box_max=None),
+]
+
+
+class TestSymmetry(unittest.TestCase):
+    def test_classes(self):
+        reduction = find_symmetries(COSTS, PROFITS)
+        self.assertEqual(reduction.object_classes, [[0, 1], [2], [3]])
+        self.assertEqual(reduction.box_classes, [[0, 1], [2]])
+        self.assertEqual(reduction.num_assignments, 4 * 4 * 3 * 2)
+        # C(2 + 3, 3) * C(1 + 2, 2) * C(1 + 1, 1)
+        self.assertEqual(reduction.num_aggregated, 10 * 3 * 2)
+        self.assertEqual(reduction.box_symmetry, 2)
+
+    def test_reduced_problem(self):
+        for instance in INSTANCES:
+            result = brute_force(**instance)
+            reduction = find_symmetries(instance["costs"], instance["profits"])
+            prob, n = build_reduced_problem(reduction, **instance)
+            prob.solve(pulp.PULP_CBC_CMD(msg=False))
+            self.assertEqual(pulp.LpStatus[prob.status], "Optimal")
+            self.assertAlmostEqual(pulp.value(prob.objective), result.optimum)
+
+            counts = {key: int(round(pulp.value(var))) for key, var in n.items()}
+            assignments = expand_counts(counts, reduction)
+            self.assertTrue(assignments)
+            for assignment in assignments:
+                self.assertEqual(score_assignment(assignment, **instance), result.optimum)
+
+    def test_missing_profit(self):
+        profits = [row[:] for row in PROFITS]
+        profits[2][0] = None
+        with self.assertRaises(ValueError):
+            find_symmetries(COSTS, profits)
+        with self.assertRaises(ValueError):
+            build_reduced_problem(find_symmetries(COSTS, PROFITS), COSTS, profits)